@@ -0,0 +1,84 @@
+import asyncio
+import os
+import ssl
+from typing import Any, Optional
+import httpx
+from services.certificate_service import CertificateService
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TELLER_API_BASE_URL = "https://api.teller.io"
+
+class TellerClient:
+    def __init__(self, certificate_service: CertificateService):
+        self.certificate_service = certificate_service
+        self.max_connections: int = int(os.getenv("TELLER_MAX_CONNECTIONS", "50"))
+        self.max_keepalive_connections: int = int(os.getenv("TELLER_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.keepalive_expiry: float = float(os.getenv("TELLER_KEEPALIVE_EXPIRY_SECONDS", "30"))
+        self.timeout: float = float(os.getenv("TELLER_TIMEOUT_SECONDS", "30"))
+        self._client_ssl_context: Optional[ssl.SSLContext] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """
+        Returns the shared keep-alive HTTP client for the running event loop. Connections are bound
+        to the loop that opened them, so a new pool is created whenever the loop changes
+        (e.g. a new `asyncio.run` in a warm Lambda) or the certificate service rotates the SSL context.
+
+        Returns:
+            httpx.AsyncClient: The pooled client used for every Teller request.
+        """
+        if self.certificate_service.needs_refresh():
+            ssl_context = await asyncio.to_thread(self.certificate_service.get_ssl_context)
+        else:
+            ssl_context = self.certificate_service.get_ssl_context()
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None or self._client.is_closed or self._client_loop is not loop
+            or self._client_ssl_context is not ssl_context
+        ):
+            logger.info(
+                "Creating Teller connection pool (max_connections=%d, max_keepalive_connections=%d)",
+                self.max_connections, self.max_keepalive_connections
+            )
+            self._client = httpx.AsyncClient(
+                base_url=TELLER_API_BASE_URL,
+                verify=ssl_context,
+                headers={'Content-Type': 'application/json'},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(self.timeout, pool=None),
+            )
+            self._client_loop = loop
+            self._client_ssl_context = ssl_context
+        return self._client
+
+    async def get(self, access_token: str, path: str, params: Optional[dict[str, Any]] = None) -> httpx.Response:
+        """
+        Issues an authenticated GET request against the Teller API.
+
+        Args:
+            access_token (str): The access token from the account link, sent as the basic auth username.
+            path (str): The API path, e.g. `/accounts`.
+            params (Optional[dict[str, Any]]): Query string parameters.
+
+        Returns:
+            httpx.Response: The raw response from Teller.
+        """
+        client = await self.get_client()
+        return await client.get(path, params=params, auth=(access_token, ''))
+
+    async def close(self):
+        """
+        Closes the connection pool if it belongs to the running event loop.
+        """
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
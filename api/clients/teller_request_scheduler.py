@@ -0,0 +1,175 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Optional
+import httpx
+from clients.teller_client import TellerClient
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes one token from the bucket, allowing the balance to go negative so that callers queue
+        up behind each other in order.
+
+        Returns:
+            float: Seconds the caller has to wait before its token becomes available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def drain(self):
+        """
+        Empties the bucket after Teller throttled the token, so the next callers back off too.
+        """
+        self.tokens = min(self.tokens, 0.0)
+        self.updated_at = time.monotonic()
+
+class TellerRequestMetrics:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests: int = 0
+        self.retries: int = 0
+        self.throttled: int = 0
+        self.server_errors: int = 0
+        self.transport_errors: int = 0
+        self.total_queue_wait: float = 0.0
+        self.max_queue_wait: float = 0.0
+
+    def record_queue_wait(self, seconds: float):
+        self.requests += 1
+        self.total_queue_wait += seconds
+        self.max_queue_wait = max(self.max_queue_wait, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "transport_errors": self.transport_errors,
+            "avg_queue_wait_seconds": round(self.total_queue_wait / self.requests, 4) if self.requests else 0.0,
+            "max_queue_wait_seconds": round(self.max_queue_wait, 4),
+        }
+
+class TellerRequestScheduler:
+    def __init__(self, teller_client: TellerClient):
+        self.teller_client = teller_client
+        self.max_concurrency: int = int(os.getenv("TELLER_MAX_CONCURRENCY", "20"))
+        self.rate_per_token: float = float(os.getenv("TELLER_RATE_PER_TOKEN", "5"))
+        self.burst_per_token: float = float(os.getenv("TELLER_BURST_PER_TOKEN", "10"))
+        self.max_retries: int = int(os.getenv("TELLER_MAX_RETRIES", "4"))
+        self.backoff_base: float = float(os.getenv("TELLER_BACKOFF_BASE_SECONDS", "0.5"))
+        self.backoff_max: float = float(os.getenv("TELLER_BACKOFF_MAX_SECONDS", "20"))
+        self.buckets: dict[str, TokenBucket] = {}
+        self.metrics = TellerRequestMetrics()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the global concurrency limiter for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def get_bucket(self, access_token: str) -> TokenBucket:
+        """
+        Returns the rate limiter for an enrollment, keyed by its access token (`AccountLink.ProviderID`).
+        """
+        bucket = self.buckets.get(access_token)
+        if bucket is None:
+            bucket = TokenBucket(rate=self.rate_per_token, capacity=self.burst_per_token)
+            self.buckets[access_token] = bucket
+        return bucket
+
+    def get_backoff_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """
+        Computes the delay before the next attempt, honouring `Retry-After` when Teller sends it
+        and otherwise using exponential backoff with full jitter.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(self, access_token: str, path: str, params: Optional[dict[str, Any]] = None) -> httpx.Response:
+        """
+        Issues a Teller GET request once the enrollment's token bucket and the global concurrency cap
+        allow it, retrying throttled, failed and 5xx responses with jittered backoff.
+
+        Args:
+            access_token (str): The access token from the account link.
+            path (str): The API path, e.g. `/accounts`.
+            params (Optional[dict[str, Any]]): Query string parameters.
+
+        Returns:
+            httpx.Response: The final response from Teller.
+        """
+        bucket = self.get_bucket(access_token)
+
+        for attempt in range(self.max_retries + 1):
+            queued_at = time.monotonic()
+
+            wait = bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            response: Optional[httpx.Response] = None
+            async with self.get_semaphore():
+                self.metrics.record_queue_wait(time.monotonic() - queued_at)
+                try:
+                    response = await self.teller_client.get(access_token, path, params=params)
+                except httpx.TransportError as e:
+                    self.metrics.transport_errors += 1
+                    if attempt == self.max_retries:
+                        raise
+                    logger.warning(f"Teller transport error on {path} (attempt {attempt + 1}): {e}")
+
+            if response is not None:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+
+                if response.status_code == 429:
+                    self.metrics.throttled += 1
+                    bucket.drain()
+                else:
+                    self.metrics.server_errors += 1
+
+                if attempt == self.max_retries:
+                    return response
+
+                logger.warning(f"Teller responded {response.status_code} on {path} (attempt {attempt + 1})")
+
+            self.metrics.retries += 1
+            await asyncio.sleep(self.get_backoff_delay(attempt, response))
+
+    async def close(self):
+        await self.teller_client.close()
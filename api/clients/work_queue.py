@@ -0,0 +1,73 @@
+import json
+import threading
+from collections import deque
+from typing import Any, Optional
+from utils.aws_session import get_boto3_session
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SQS_SEND_BATCH_SIZE = 10
+
+class SqsWorkQueue:
+    def __init__(self, queue_url: str, region_name: str):
+        self.queue_url = queue_url
+        self.region_name = region_name
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        The SQS client, created from the shared boto3 session on first use.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = get_boto3_session().client('sqs', region_name=self.region_name)
+        return self._client
+
+    def send_work_items(self, work_items: list[dict[str, Any]]):
+        """
+        Sends work items to the queue as JSON messages, 10 per SendMessageBatch request.
+
+        Args:
+            work_items (list[dict[str, Any]]): The work items to enqueue.
+        """
+        for start in range(0, len(work_items), SQS_SEND_BATCH_SIZE):
+            chunk = work_items[start:start + SQS_SEND_BATCH_SIZE]
+            response = self.client.send_message_batch(
+                QueueUrl=self.queue_url,
+                Entries=[
+                    {"Id": str(index), "MessageBody": json.dumps(work_item)}
+                    for index, work_item in enumerate(chunk)
+                ],
+            )
+
+            failed = response.get("Failed", [])
+            if failed:
+                logger.error(f"Failed to enqueue {len(failed)} work items: {failed}")
+                raise RuntimeError("Failed to enqueue work items")
+
+        logger.info("Enqueued %d work items", len(work_items))
+
+class InProcessWorkQueue:
+    """
+    Keeps work items in memory so the coordinator can run its shards in the same process when no
+    queue is configured, e.g. locally or in tests.
+    """
+
+    def __init__(self):
+        self.work_items: "deque[dict[str, Any]]" = deque()
+        self._lock = threading.Lock()
+
+    def send_work_items(self, work_items: list[dict[str, Any]]):
+        with self._lock:
+            self.work_items.extend(work_items)
+
+    def receive_work_item(self) -> Optional[dict[str, Any]]:
+        """
+        Returns the oldest queued work item, or None if the queue is empty.
+        """
+        with self._lock:
+            return self.work_items.popleft() if self.work_items else None
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from services.authentication_service import AuthenticationService
-from schema.account_schema import AccountCreateRequest, AccountCreateResponse, AccountGetResponse
+from schema.account_schema import AccountCreateRequest, AccountCreateResponse, AccountGetResponse, BalanceHistoryGetResponse
 from services.account_service import AccountService
 from utils.logger import get_logger
 
@@ -23,6 +25,33 @@ def create_accounts_controller(account_service: AccountService) -> APIRouter:
             logger.error(f"Error retrieving accounts for user {user_id}: {e}")
             raise HTTPException(status_code=500, detail="Failed to retrieve accounts")
     
+    @router.get("/accounts/{account_id}/balance-history")
+    async def get_balance_history(
+        account_id: str,
+        from_date: Optional[date] = Query(None, alias="from", description="First day to include, 30 days ago by default"),
+        to_date: Optional[date] = Query(None, alias="to", description="Last day to include, today by default"),
+        user_id: str = Depends(auth_service.extract_user_id)
+    ) -> BalanceHistoryGetResponse:
+        try:
+            if not user_id:
+                logger.error("User ID is required but not provided.")
+                raise HTTPException(status_code=400, detail="User ID is required")
+
+            to_date = to_date or datetime.now(tz=timezone.utc).date()
+            from_date = from_date or to_date - timedelta(days=30)
+
+            points = account_service.get_balance_history(user_id, account_id, from_date.isoformat(), to_date.isoformat())
+            logger.info(f"Retrieved {len(points)} balance history points for account {account_id} of {user_id}")
+            return {"account_id": account_id, "points": points}
+        except HTTPException:
+            raise
+        except ValueError as e:
+            logger.warning(f"Invalid balance history request for user {user_id}: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error retrieving balance history for account {account_id} of user {user_id}: {e}")
+            raise HTTPException(status_code=500, detail="Failed to retrieve balance history")
+
     @router.post("/accounts")
     async def create_account(
         account_request: AccountCreateRequest = Body(..., description="Account creation data"),
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from services.transaction_service import TransactionService
 from services.authentication_service import AuthenticationService
 from schema.transaction_schema import TransactionGetResponse, TransactionEditRequest
@@ -10,19 +12,71 @@ auth_service = AuthenticationService()
 
 def create_transactions_controller(transaction_service: TransactionService) -> APIRouter:
     @router.get("/transactions")
-    async def get_transactions(user_id: str = Depends(auth_service.extract_user_id)) -> TransactionGetResponse:
+    async def get_transactions(
+        limit: int = Query(100, ge=1, le=500, description="Maximum number of transactions to return"),
+        cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+        from_date: Optional[date] = Query(None, alias="from", description="Earliest transaction date to include"),
+        to_date: Optional[date] = Query(None, alias="to", description="Latest transaction date to include"),
+        account_id: Optional[str] = Query(None, description="Only return transactions for this account"),
+        user_id: str = Depends(auth_service.extract_user_id)
+    ) -> TransactionGetResponse:
         try:
             if not user_id:
                 logger.error("User ID is required but not provided.")
                 raise HTTPException(status_code=400, detail="User ID is required")
             
-            transactions = transaction_service.get_transactions(user_id)
-            logger.info(f"Transactions retrieved for {user_id}: {transactions}")
-            return {"transactions": transactions}
+            transactions, next_cursor = transaction_service.get_transactions(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                from_date=from_date.isoformat() if from_date else None,
+                to_date=to_date.isoformat() if to_date else None,
+                account_id=account_id
+            )
+            logger.info(f"Retrieved {len(transactions)} transactions for {user_id}")
+            return {"transactions": transactions, "next_cursor": next_cursor}
+        except HTTPException:
+            raise
+        except ValueError as e:
+            logger.warning(f"Invalid transactions request for user {user_id}: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error retrieving transactions for user {user_id}: {e}")
             raise HTTPException(status_code=500, detail="Failed to retrieve transactions")
         
+    @router.get("/accounts/{account_id}/transactions")
+    async def get_account_transactions(
+        account_id: str,
+        limit: int = Query(100, ge=1, le=500, description="Maximum number of transactions to return"),
+        cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+        from_date: Optional[date] = Query(None, alias="from", description="Earliest transaction date to include"),
+        to_date: Optional[date] = Query(None, alias="to", description="Latest transaction date to include"),
+        user_id: str = Depends(auth_service.extract_user_id)
+    ) -> TransactionGetResponse:
+        try:
+            if not user_id:
+                logger.error("User ID is required but not provided.")
+                raise HTTPException(status_code=400, detail="User ID is required")
+
+            transactions, next_cursor = transaction_service.get_transactions(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                from_date=from_date.isoformat() if from_date else None,
+                to_date=to_date.isoformat() if to_date else None,
+                account_id=account_id
+            )
+            logger.info(f"Retrieved {len(transactions)} transactions for account {account_id} of {user_id}")
+            return {"transactions": transactions, "next_cursor": next_cursor}
+        except HTTPException:
+            raise
+        except ValueError as e:
+            logger.warning(f"Invalid account transactions request for user {user_id}: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error retrieving transactions for account {account_id} of user {user_id}: {e}")
+            raise HTTPException(status_code=500, detail="Failed to retrieve transactions")
+
     @router.put("/transactions/{transaction_id}")
     async def edit_transaction(
         transaction_id: str,
@@ -1,13 +1,226 @@
-import boto3
-from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource, _Table
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 import os
+from utils.aws_session import get_boto3_session
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource, _Table
+
+logger = get_logger(__name__)
+
+ENTITY_TYPE_INDEX_NAME = "EntityTypeIndex"
+TRANSACTION_DATE_INDEX_NAME = "TransactionDateIndex"
+ACCOUNT_TRANSACTION_INDEX_NAME = "AccountTransactionIndex"
+ACCOUNT_SYNC_INDEX_NAME = "AccountSyncIndex"
+BATCH_GET_MAX_KEYS = 100
+BATCH_RETRY_BASE_SECONDS = 0.05
+BATCH_RETRY_MAX_SECONDS = 2.0
+PARALLEL_SCAN_QUEUE_PAGES_PER_SEGMENT = 2
+_SEGMENT_DONE = object()
 
 class DynamoDBClient:
     def __init__(self):
-        self.dynamodb: DynamoDBServiceResource = boto3.resource('dynamodb', region_name=os.getenv('AWS_REGION'))
-        self.table = self.dynamodb.Table(os.getenv('DYNAMO_DB_TABLE_NAME'))
+        self._dynamodb: Optional["DynamoDBServiceResource"] = None
+        self._table: Optional["_Table"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def dynamodb(self) -> "DynamoDBServiceResource":
+        """
+        The DynamoDB resource, created from the shared boto3 session on first use rather than at import.
+        """
+        if self._dynamodb is None:
+            with self._lock:
+                if self._dynamodb is None:
+                    self._dynamodb = get_boto3_session().resource('dynamodb', region_name=os.getenv('AWS_REGION'))
+        return self._dynamodb
+
+    @property
+    def table(self) -> "_Table":
+        if self._table is None:
+            dynamodb = self.dynamodb
+            with self._lock:
+                if self._table is None:
+                    self._table = dynamodb.Table(os.getenv('DYNAMO_DB_TABLE_NAME'))
+        return self._table
 
-    def get_table(self) -> _Table:
+    def get_table(self) -> "_Table":
         return self.table
 
+    def batch_delete_items(self, keys: list[dict[str, Any]]):
+        """
+        Deletes items by primary key with BatchWriteItem through the table's batch writer.
+
+        Args:
+            keys (list[dict[str, Any]]): The `PK`/`SK` keys of the items to delete.
+        """
+        with self.table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+            for key in keys:
+                batch.delete_item(Key=key)
+
+    def query_pages(self, **kwargs) -> Iterator[list[dict[str, Any]]]:
+        """
+        Runs a query and yields each page of items, following `LastEvaluatedKey` until the result is exhausted.
+
+        Args:
+            **kwargs: Arguments passed through to `Table.query`.
+
+        Returns:
+            Iterator[list[dict[str, Any]]]: The pages of items.
+        """
+        yield from self._paginate(self.table.query, **kwargs)
+
+    def query_items(self, **kwargs) -> Iterator[dict[str, Any]]:
+        """
+        Runs a query and lazily yields every matching item across all pages.
+
+        Args:
+            **kwargs: Arguments passed through to `Table.query`.
+
+        Returns:
+            Iterator[dict[str, Any]]: The matching items.
+        """
+        for page in self.query_pages(**kwargs):
+            yield from page
+
+    def scan_items(self, total_segments: int = 1, **kwargs) -> Iterator[dict[str, Any]]:
+        """
+        Scans the table and lazily yields every matching item across all pages. With more than one
+        segment, the segments are scanned concurrently on worker threads and their pages are yielded
+        as they arrive, so items are not returned in key order.
+
+        Args:
+            total_segments (int): The number of parallel scan segments.
+            **kwargs: Arguments passed through to the scan call.
+
+        Returns:
+            Iterator[dict[str, Any]]: The matching items.
+        """
+        if total_segments <= 1:
+            for page in self._paginate(self.table.scan, **kwargs):
+                yield from page
+            return
+
+        pages: queue.Queue = queue.Queue(maxsize=total_segments * PARALLEL_SCAN_QUEUE_PAGES_PER_SEGMENT)
+        stopped = threading.Event()
+
+        def put(value: Any) -> bool:
+            while not stopped.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan_segment(segment: int):
+            try:
+                for page in self.scan_segment_pages(segment, total_segments, **kwargs):
+                    if not put(page):
+                        return
+            except Exception as e:
+                put(e)
+            finally:
+                put(_SEGMENT_DONE)
+
+        executor = ThreadPoolExecutor(max_workers=total_segments)
+        try:
+            for segment in range(total_segments):
+                executor.submit(scan_segment, segment)
+
+            remaining_segments = total_segments
+            while remaining_segments:
+                page = pages.get()
+                if page is _SEGMENT_DONE:
+                    remaining_segments -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False)
+
+    def scan_segment_pages(self, segment: int, total_segments: int, **kwargs) -> Iterator[list[dict[str, Any]]]:
+        """
+        Scans one segment of a parallel scan and yields its pages.
+
+        Args:
+            segment (int): The zero-based segment to scan.
+            total_segments (int): The total number of segments the scan is split into.
+            **kwargs: Arguments passed through to the scan call.
+
+        Returns:
+            Iterator[list[dict[str, Any]]]: The pages of items in the segment.
+        """
+        yield from self._paginate(
+            self.dynamodb.meta.client.scan, TableName=self.table.name, Segment=segment, TotalSegments=total_segments, **kwargs
+        )
+
+    def _paginate(self, operation, **kwargs) -> Iterator[list[dict[str, Any]]]:
+        while True:
+            response = operation(**kwargs)
+            yield response.get("Items", [])
+
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if not last_evaluated_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+    def batch_get_items(
+        self, keys: list[dict[str, Any]], projection_expression: Optional[str] = None,
+        expression_attribute_names: Optional[dict[str, str]] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Reads items by primary key with BatchGetItem, 100 keys per request, retrying unprocessed keys
+        with exponential backoff.
+
+        Args:
+            keys (list[dict[str, Any]]): The `PK`/`SK` keys of the items to read.
+            projection_expression (Optional[str]): Attributes to return, all attributes if omitted.
+            expression_attribute_names (Optional[dict[str, str]]): Placeholders used in the projection.
+
+        Returns:
+            list[dict[str, Any]]: The items that exist, in no particular order.
+        """
+        table_name = self.table.name
+        items = []
+
+        for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            keys_and_attributes: dict[str, Any] = {"Keys": keys[start:start + BATCH_GET_MAX_KEYS]}
+            if projection_expression:
+                keys_and_attributes["ProjectionExpression"] = projection_expression
+            if expression_attribute_names:
+                keys_and_attributes["ExpressionAttributeNames"] = expression_attribute_names
+
+            request_items = {table_name: keys_and_attributes}
+            attempt = 0
+            while request_items:
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                items.extend(response.get("Responses", {}).get(table_name, []))
+                request_items = response.get("UnprocessedKeys") or None
+
+                if request_items:
+                    attempt += 1
+                    logger.warning("Retrying %d unprocessed keys (attempt %d)", len(request_items[table_name]["Keys"]), attempt)
+                    time.sleep(min(BATCH_RETRY_MAX_SECONDS, BATCH_RETRY_BASE_SECONDS * (2 ** attempt)))
+
+        return items
+
+    def batch_put_items(self, items: list[dict[str, Any]]):
+        """
+        Writes items with BatchWriteItem through the table's batch writer, which sends 25 items per
+        request and resubmits unprocessed items.
+
+        Args:
+            items (list[dict[str, Any]]): The items to put.
+        """
+        with self.table.batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+            for item in items:
+                batch.put_item(Item=item)
+
 db_client = DynamoDBClient()
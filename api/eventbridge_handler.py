@@ -1,36 +1,98 @@
+import time
+startup_started_at = time.perf_counter()
+
 import asyncio
-import os
-from services.account_service import AccountService
-from services.certificate_service import CertificateService
-from services.teller_service import TellerService
-from services.scheduler_service import SchedulerService
-from repositories.secrets_repository import SecretsRepository
+import json
 from utils.logger import get_logger
+from utils.service_container import ServiceContainer, log_startup_duration
 
 logger = get_logger(__name__)
 
-aws_region = os.getenv('AWS_REGION', 'us-east-1')
-secrets_repository = SecretsRepository(region_name=aws_region)
-certificate_service = CertificateService(secrets_repository=secrets_repository)
-teller_service = TellerService(certificate_service=certificate_service)
-account_service = AccountService(teller_service=teller_service)
-scheduler_service = SchedulerService(account_service=account_service, teller_service=teller_service)
+container = ServiceContainer()
+
+log_startup_duration("Scheduled task", startup_started_at)
+
+async def run_task(task_coroutine):
+    """
+    Runs a scheduled task and releases the pooled Teller connections opened on its event loop.
+    """
+    try:
+        return await task_coroutine
+    finally:
+        await container.teller_service.close()
+
+def get_remaining_seconds_getter(context):
+    """
+    Returns a callable reporting the seconds left in the Lambda invocation, or None outside Lambda.
+    """
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return None
+    return lambda: context.get_remaining_time_in_millis() / 1000
+
+def handle_queue_records(records, context):
+    """
+    Processes consolidation shard work items delivered by SQS. A failed shard raises, so the message
+    is redelivered and resumes from its checkpoint.
+    """
+    results = []
+    for record in records:
+        work_item = json.loads(record["body"])
+        logger.info("Starting task: %s (run %s, shard %s)", work_item.get("task"), work_item.get("run_id"), work_item.get("shard_index"))
+        results.append(asyncio.run(run_task(
+            container.scheduler_service.process_consolidation_shard(work_item, get_remaining_seconds_getter(context))
+        )))
+    logger.info(f"Task completed successfully: {results}")
+    return results
 
 def handler(event, context):
     """
-    This function will be triggered by AWS EventBridge.
+    This function will be triggered by AWS EventBridge, or by SQS for consolidation shards.
     """
     try:
+        if "Records" in event:
+            return handle_queue_records(event["Records"], context)
+
         logger.info(f"Event received: {event}")
         task = event.get("task")
         
         if task == "consolidate_account_balances":
             logger.info("Starting task: consolidate_account_balances")
-            result = asyncio.run(scheduler_service.consolidate_account_balances())
+            result = asyncio.run(run_task(container.scheduler_service.consolidate_account_balances()))
+            logger.info(f"Task completed successfully: {result}")
+        elif task == "consolidate_transactions":
+            full_resync = bool(event.get("full_resync", False))
+            logger.info("Starting task: consolidate_transactions (full_resync=%s)", full_resync)
+            result = asyncio.run(run_task(container.scheduler_service.consolidate_transactions(full_resync=full_resync)))
+            logger.info(f"Task completed successfully: {result}")
+        elif task == "consolidate_all":
+            full_resync = bool(event.get("full_resync", False))
+            only_due = bool(event.get("only_due", True))
+            logger.info("Starting task: consolidate_all (full_resync=%s, only_due=%s)", full_resync, only_due)
+            result = asyncio.run(run_task(
+                container.scheduler_service.consolidate_all(full_resync=full_resync, only_due=only_due)
+            ))
+            logger.info(f"Task completed successfully: {result}")
+        elif task == "coordinate_consolidation":
+            logger.info("Starting task: coordinate_consolidation")
+            result = asyncio.run(run_task(container.scheduler_service.coordinate_consolidation()))
+            logger.info(f"Task completed successfully: {result}")
+        elif task == "process_consolidation_shard":
+            logger.info("Starting task: process_consolidation_shard")
+            result = asyncio.run(run_task(
+                container.scheduler_service.process_consolidation_shard(event, get_remaining_seconds_getter(context))
+            ))
+            logger.info(f"Task completed successfully: {result}")
+        elif task == "backfill_entity_type_index":
+            logger.info("Starting task: backfill_entity_type_index")
+            result = container.scheduler_service.backfill_entity_type_index()
+            logger.info(f"Task completed successfully: {result}")
+        elif task == "migrate_transaction_keys":
+            logger.info("Starting task: migrate_transaction_keys")
+            result = container.scheduler_service.migrate_transaction_keys()
             logger.info(f"Task completed successfully: {result}")
-        if task == "consolidate_transactions":
-            logger.info("Starting task: consolidate_transactions")
-            result = asyncio.run(scheduler_service.consolidate_transactions())
+        elif task == "backfill_transaction_dates":
+            logger.info("Starting task: backfill_transaction_dates")
+            result = container.scheduler_service.backfill_transaction_dates()
             logger.info(f"Task completed successfully: {result}")
         else:
             error_message = f"Unknown task received: {task}"
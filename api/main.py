@@ -1,16 +1,13 @@
-import os
+import time
+startup_started_at = time.perf_counter()
+
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
-from services.transaction_service import TransactionService
-from services.account_service import AccountService
 from controllers.accounts_controller import create_accounts_controller
 from controllers.transactions_controller import create_transactions_controller
-from services.certificate_service import CertificateService
-from services.teller_service import TellerService
-from services.scheduler_service import SchedulerService
-from repositories.secrets_repository import SecretsRepository
 from utils.logger import get_logger
+from utils.service_container import ServiceContainer, log_startup_duration
 
 logger = get_logger(__name__)
 app = FastAPI()
@@ -33,15 +30,11 @@ async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled error: {exc}")
     raise HTTPException(status_code=500, detail="An unexpected error occurred. Please try again later.")
 
-aws_region = os.getenv('AWS_REGION', 'us-east-1')
-secrets_repository = SecretsRepository(region_name=aws_region)
-certificate_service = CertificateService(secrets_repository=secrets_repository)
-teller_service = TellerService(certificate_service=certificate_service)
-account_service = AccountService(teller_service=teller_service)
-transaction_service = TransactionService(teller_service=teller_service)
-scheduler_service = SchedulerService(account_service=account_service, teller_service=teller_service)
+container = ServiceContainer()
+
+app.include_router(create_accounts_controller(container.account_service))
+app.include_router(create_transactions_controller(container.transaction_service))
 
-app.include_router(create_accounts_controller(account_service))
-app.include_router(create_transactions_controller(transaction_service))
+handler = Mangum(app)
 
-handler = Mangum(app)
\ No newline at end of file
+log_startup_duration("API", startup_started_at)
\ No newline at end of file
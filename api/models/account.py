@@ -1,5 +1,7 @@
 from pydantic import BaseModel
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
+
+BALANCE_HISTORY_SORT_KEY_PREFIX = "BalanceHistory#"
 
 class Account(BaseModel):
     PK: str
@@ -11,6 +13,9 @@ class Account(BaseModel):
     EntityData: Dict[str, Any]
     Timestamp: int
     Metadata: Optional[Dict[str, Any]] = {}
+    IndexedEntityType: Optional[str] = None
+    NextSyncAt: Optional[int] = None
+    SyncIdleRuns: Optional[int] = None
 
 class Balance(BaseModel):
     PK: str
@@ -22,6 +27,7 @@ class Balance(BaseModel):
     EntityData: Dict[str, Any]
     Timestamp: int
     Metadata: Optional[Dict[str, Any]] = {}
+    HistoryDate: Optional[str] = None
 
 class AccountLink(BaseModel):
     PK: str
@@ -31,4 +37,37 @@ class AccountLink(BaseModel):
     EntityType: str
     EntityData: Dict[str, Any]
     Timestamp: int
-    Metadata: Optional[Dict[str, Any]] = {}
\ No newline at end of file
+    Metadata: Optional[Dict[str, Any]] = {}
+    IndexedEntityType: Optional[str] = None
+    NextSyncAt: Optional[int] = None
+
+class SyncCursor(BaseModel):
+    PK: str
+    SK: str
+    Provider: str
+    ProviderID: str
+    EntityType: str
+    EntityID: str
+    EntityData: Dict[str, Any]
+    Timestamp: int
+    Metadata: Optional[Dict[str, Any]] = {}
+
+class AccountSummary(BaseModel):
+    PK: str
+    SK: str
+    EntityType: str
+    EntityData: Dict[str, Any]
+    Timestamp: int
+    Metadata: Optional[Dict[str, Any]] = {}
+
+class BalanceHistory(BaseModel):
+    PK: str
+    SK: str
+    EntityType: str
+    EntityID: str
+    Points: Dict[str, List[Any]] = {}
+    Timestamp: int
+    Metadata: Optional[Dict[str, Any]] = {}
+
+def get_balance_history_sort_key(account_id: str, history_date: str) -> str:
+    return f"{BALANCE_HISTORY_SORT_KEY_PREFIX}{account_id}#{history_date}"
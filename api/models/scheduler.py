@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Any, Optional, Dict
+
+class SchedulerCheckpoint(BaseModel):
+    PK: str
+    SK: str
+    EntityType: str
+    EntityData: Dict[str, Any]
+    Timestamp: int
+    Metadata: Optional[Dict[str, Any]] = {}
+    ExpiresAt: Optional[int] = None
@@ -1,6 +1,21 @@
+import hashlib
+import json
 from pydantic import BaseModel
 from typing import Any, Optional, Dict
 
+TRANSACTION_SORT_KEY_PREFIX = "Transaction#"
+
+# EntityData paths owned by Teller. A sync rewrites each of these individually, skipping any path listed
+# in the item's `UserEditedFields` set so edits made through the API survive later syncs.
+TELLER_FIELD_PATHS = (
+    "account_id", "amount", "date", "description", "id", "running_balance", "status", "type",
+    "details.processing_status", "details.category",
+)
+
+# Paths a user can edit from the app. Items written before `ContentHash` existed never recorded their
+# edits, so these are treated as edited on those items.
+USER_EDITABLE_FIELD_PATHS = ("description", "details.category")
+
 class Transaction(BaseModel):
     PK: str
     SK: str
@@ -10,4 +25,21 @@ class Transaction(BaseModel):
     EntityID: str
     EntityData: Dict[str, Any]
     Timestamp: int
-    Metadata: Optional[Dict[str, Any]] = {}
\ No newline at end of file
+    Metadata: Optional[Dict[str, Any]] = {}
+    TransactionDate: Optional[str] = None
+    AccountTransactionDate: Optional[str] = None
+    ContentHash: Optional[str] = None
+
+def get_account_transaction_date(account_id: str, transaction_date: str, transaction_id: str) -> str:
+    """
+    Returns the `AccountTransactionDate` index key, which orders an account's transactions by date.
+    """
+    return f"{account_id}#{transaction_date}#{transaction_id}"
+
+def get_content_hash(entity_data: Dict[str, Any]) -> str:
+    """
+    Returns a compact hash of a transaction's EntityData, serialized with sorted keys so the same
+    content always hashes the same regardless of field order.
+    """
+    normalized = json.dumps(entity_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
@@ -1,31 +1,215 @@
-import boto3
+import os
+import threading
+import time
+from typing import Optional
 from botocore.exceptions import ClientError
 from fastapi import HTTPException
+from utils.aws_session import get_boto3_session
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_VERSION_STAGE = "AWSCURRENT"
+BATCH_GET_SECRET_LIMIT = 20
+
 class SecretsRepository:
     def __init__(self, region_name: str):
-        self.client = boto3.client('secretsmanager', region_name=region_name)
+        self.region_name = region_name
+        self.ttl_seconds: float = float(os.getenv('SECRET_CACHE_TTL_SECONDS', '300'))
+        self.max_stale_seconds: float = float(os.getenv('SECRET_CACHE_MAX_STALE_SECONDS', '86400'))
+        self.version_stage: str = os.getenv('SECRET_VERSION_STAGE', DEFAULT_VERSION_STAGE)
+        self.batch_enabled: bool = self.version_stage == DEFAULT_VERSION_STAGE
+        self._cache: dict[str, tuple[float, str, str]] = {}
+        self._refreshing: set[str] = set()
+        self._cache_lock = threading.Lock()
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """
+        The Secrets Manager client, created from the shared boto3 session on first use.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = get_boto3_session().client('secretsmanager', region_name=self.region_name)
+        return self._client
 
     def get_secret(self, secret_name: str) -> str:
+        """
+        Return a secret from AWS Secrets manager
+
+        Args:
+            secret_name (str): Name of the AWS secret.
+
+        Returns:
+            secret (str): The retrieved secret value
+        """
+        secret, _ = self.get_secret_with_version(secret_name)
+        return secret
+
+    def get_secret_with_version(self, secret_name: str) -> tuple[str, str]:
+        """
+        Return a secret and its version ID from AWS Secrets manager
+
+        Args:
+            secret_name (str): Name of the AWS secret.
+
+        Returns:
+            tuple[str, str]: The retrieved secret value and its version ID
+        """
+        return self.get_secrets_with_versions([secret_name])[secret_name]
+
+    def get_secrets_with_versions(self, secret_names: list[str]) -> dict[str, tuple[str, str]]:
+        """
+        Return several secrets and their version IDs, served from the in-memory cache where possible.
+        Entries younger than `SECRET_CACHE_TTL_SECONDS` are returned as is. Older entries are still
+        returned while a background refresh runs, up to `SECRET_CACHE_MAX_STALE_SECONDS`. Missing or
+        expired secrets are fetched together in a single `BatchGetSecretValue` call.
+
+        Args:
+            secret_names (list[str]): Names of the AWS secrets.
+
+        Returns:
+            dict[str, tuple[str, str]]: Each secret name mapped to its value and version ID
+        """
+        now = time.monotonic()
+        results: dict[str, tuple[str, str]] = {}
+        missing: list[str] = []
+        stale: list[str] = []
+
+        with self._cache_lock:
+            for secret_name in dict.fromkeys(secret_names):
+                entry = self._cache.get(secret_name)
+                age = now - entry[0] if entry else None
+
+                if entry is None or age >= self.max_stale_seconds:
+                    missing.append(secret_name)
+                    continue
+
+                results[secret_name] = (entry[1], entry[2])
+                if age >= self.ttl_seconds and secret_name not in self._refreshing:
+                    self._refreshing.add(secret_name)
+                    stale.append(secret_name)
+
+        if stale:
+            threading.Thread(target=self._revalidate, args=(stale,), daemon=True).start()
+
+        if missing:
+            results.update(self._fetch_and_cache(missing))
+
+        return results
+
+    def invalidate(self, secret_name: Optional[str] = None):
+        """
+        Drops one cached secret, or the whole cache when no name is given.
+
+        Args:
+            secret_name (Optional[str]): Name of the AWS secret to drop.
+        """
+        with self._cache_lock:
+            if secret_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(secret_name, None)
+
+    def _revalidate(self, secret_names: list[str]):
+        """
+        Refreshes stale secrets in the background. On failure the stale values stay cached and the
+        next read past the TTL tries again.
+
+        Args:
+            secret_names (list[str]): Names of the AWS secrets to refresh.
+        """
         try:
-            """
-            Return a secret from AWS Secrets manager
+            self._fetch_and_cache(secret_names)
+        except Exception as e:
+            logger.warning(f"Background refresh of secrets {secret_names} failed, serving cached values: {e}")
+        finally:
+            with self._cache_lock:
+                self._refreshing.difference_update(secret_names)
+
+    def _fetch_and_cache(self, secret_names: list[str]) -> dict[str, tuple[str, str]]:
+        """
+        Fetches secrets from Secrets Manager and stores them in the cache.
+
+        Args:
+            secret_names (list[str]): Names of the AWS secrets.
+
+        Returns:
+            dict[str, tuple[str, str]]: Each secret name mapped to its value and version ID
+        """
+        if self.batch_enabled and len(secret_names) > 1:
+            fetched = self._batch_get_secret_values(secret_names)
+        else:
+            fetched = {}
+
+        for secret_name in secret_names:
+            if secret_name not in fetched:
+                fetched[secret_name] = self._get_secret_value(secret_name)
+
+        fetched_at = time.monotonic()
+        with self._cache_lock:
+            for secret_name, (secret, version_id) in fetched.items():
+                self._cache[secret_name] = (fetched_at, secret, version_id)
+
+        return fetched
 
-            Args:
-                secret_name (str): Name of the AWS secret.
+    def _batch_get_secret_values(self, secret_names: list[str]) -> dict[str, tuple[str, str]]:
+        """
+        Fetches up to 20 secrets per `BatchGetSecretValue` call. The batch API only serves the
+        current version, so it is used only with the default version stage. Secrets it could not
+        return are left out, and the caller falls back to fetching them one at a time.
 
-            Returns:
-                secret (str): The retrieved secret value
-            """
-            response = self.client.get_secret_value(SecretId=secret_name)
+        Args:
+            secret_names (list[str]): Names of the AWS secrets.
+
+        Returns:
+            dict[str, tuple[str, str]]: Each returned secret name mapped to its value and version ID
+        """
+        fetched: dict[str, tuple[str, str]] = {}
+
+        for start in range(0, len(secret_names), BATCH_GET_SECRET_LIMIT):
+            chunk = secret_names[start:start + BATCH_GET_SECRET_LIMIT]
+            try:
+                response = self.client.batch_get_secret_value(SecretIdList=chunk)
+            except (ClientError, AttributeError) as e:
+                logger.warning(f"BatchGetSecretValue unavailable, fetching secrets individually: {e}")
+                self.batch_enabled = False
+                return fetched
+
+            for secret_value in response.get('SecretValues', []):
+                secret = secret_value.get('SecretString')
+                secret_name = secret_value.get('Name')
+                if secret and secret_name in chunk:
+                    fetched[secret_name] = (secret, secret_value.get('VersionId', ''))
+                    logger.info("Retrieved %s", secret_name)
+
+            for error in response.get('Errors', []):
+                logger.warning(f"Error retrieving secret {error.get('SecretId')} in batch: {error.get('ErrorCode')}")
+
+        return fetched
+
+    def _get_secret_value(self, secret_name: str) -> tuple[str, str]:
+        """
+        Fetches a single secret at the configured version stage.
+
+        Args:
+            secret_name (str): Name of the AWS secret.
+
+        Returns:
+            tuple[str, str]: The retrieved secret value and its version ID
+        """
+        try:
+            response = self.client.get_secret_value(SecretId=secret_name, VersionStage=self.version_stage)
             secret = response.get('SecretString')
             if not secret:
                 raise HTTPException(status_code=500, detail=f"Secret {secret_name} is empty")
             logger.info("Retrieved %s", secret_name)
-            return secret
+            return secret, response.get('VersionId', '')
+        except HTTPException:
+            raise
         except ClientError as e:
             logger.error(f"Error retrieving secret {secret_name}: {e}")
             raise HTTPException(status_code=500, detail=f"Error retrieving secret {secret_name}")
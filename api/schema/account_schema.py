@@ -19,4 +19,14 @@ class CategorizedAccounts(BaseModel):
 
 class AccountGetResponse(BaseModel):
     debit: CategorizedAccounts
-    credit: CategorizedAccounts
\ No newline at end of file
+    credit: CategorizedAccounts
+
+class BalanceHistoryPoint(BaseModel):
+    date: str
+    hour: int
+    ledger: str
+    available: str
+
+class BalanceHistoryGetResponse(BaseModel):
+    account_id: str
+    points: list[BalanceHistoryPoint]
@@ -1,8 +1,10 @@
+from typing import Optional
 from pydantic import BaseModel
 from models.teller import TellerTransaction, PartialTellerTransaction
 
 class TransactionGetResponse(BaseModel):
     transactions: list[TellerTransaction]
+    next_cursor: Optional[str] = None
 
 class TransactionEditRequest(PartialTellerTransaction):
     pass
\ No newline at end of file
@@ -1,20 +1,30 @@
-from collections import defaultdict
+import asyncio
+import json
+import os
 from datetime import datetime, timezone
-from typing import Union
+from decimal import Decimal
+from typing import Optional, Union
 from models.teller import CREDIT_SUBTYPES, DEPOSITORY_SUBTYPES
 from services.teller_service import TellerService
-from models.account import AccountLink, Account, Balance
+from models.account import AccountLink, Account, AccountSummary, Balance, BalanceHistory, get_balance_history_sort_key
 from models.teller import TellerAccountBalance, TellerAccount
-from db.dynamodb_client import db_client
-from schema.account_schema import AccountCreateRequest, CategorizedAccounts
+from db.dynamodb_client import db_client, ENTITY_TYPE_INDEX_NAME
+from schema.account_schema import AccountCreateRequest, BalanceHistoryPoint, CategorizedAccounts
 from boto3.dynamodb.conditions import Key, Attr
 from utils.logger import get_logger
+from utils.ttl_cache import TTLCache
 
 logger = get_logger(__name__)
 
+ACCOUNT_SUMMARY_SORT_KEY = "AccountSummary"
+
 class AccountService:
     def __init__(self, teller_service: TellerService):
         self.teller_service = teller_service
+        self.categorized_accounts_cache = TTLCache(
+            max_size=int(os.getenv("ACCOUNTS_CACHE_MAX_USERS", "1000")),
+            ttl_seconds=float(os.getenv("ACCOUNTS_CACHE_TTL_SECONDS", "300")),
+        )
 
     def create_account_link(self, account_link_request: AccountCreateRequest, user_id: str) -> AccountLink:
         """
@@ -35,7 +45,9 @@ class AccountService:
             EntityType="Account Link",
             EntityData=account_link_request.entity_data,
             Timestamp=int(datetime.now(tz=timezone.utc).timestamp()),
-            Metadata=account_link_request.metadata
+            Metadata=account_link_request.metadata,
+            IndexedEntityType="Account Link",
+            NextSyncAt=0
         )
 
         item = account.model_dump()
@@ -44,13 +56,16 @@ class AccountService:
         
         table = db_client.get_table()
         table.put_item(Item=item)
+        table.delete_item(Key={"PK": user_id, "SK": ACCOUNT_SUMMARY_SORT_KEY})
+        self.invalidate_categorized_accounts(user_id)
         
         return account
     
     def get_account_links(self, user_id: str = None) -> list[AccountLink]:
         """
         Retrieve account link objects. If user_id is provided, it fetches account links for that user.
-        If user_id is not provided, it fetches account links for all users across all applications.
+        If user_id is not provided, it fetches account links for all users across all applications
+        from the sparse `EntityTypeIndex`, which only holds account links and accounts.
 
         Args:
             user_id (str, optional): The user ID whose account links are to be retrieved. If not provided, fetches all account links.
@@ -58,19 +73,17 @@ class AccountService:
         Returns:
             list[AccountLink]: A list of AccountLink objects.
         """
-        table = db_client.get_table()
-
         if user_id:
-            response = table.query(
+            items = db_client.query_items(
                 KeyConditionExpression=Key("PK").eq(user_id),
                 FilterExpression=Attr("EntityType").eq("Account Link")
             )
         else:
-            response = table.scan(
-                FilterExpression=Attr("EntityType").eq("Account Link")
+            items = db_client.query_items(
+                IndexName=ENTITY_TYPE_INDEX_NAME,
+                KeyConditionExpression=Key("IndexedEntityType").eq("Account Link")
             )
 
-        items = response.get("Items", [])
         account_links = [AccountLink(**item) for item in items]
 
         if user_id:
@@ -84,7 +97,8 @@ class AccountService:
         self, all_accounts: list[list[TellerAccount]], all_balances: list[list[TellerAccountBalance]]
     ) -> list[dict]:
         """
-        Combine accounts and their balances into a single list by matching them directly.
+        Combine accounts and their balances into a single list by joining them on the account ID.
+        Accounts without a balance and balances without an account are reported and left out.
 
         Args:
             all_accounts (list[list[TellerAccount]]): The accounts.
@@ -94,32 +108,40 @@ class AccountService:
             list[dict]: A list of dictionaries containing account details and balances.
         """
         logger.info("Combining accounts and balances")
+        balances_by_account_id = {
+            balance.account_id: balance for balance_list in all_balances for balance in balance_list
+        }
+
         accounts_with_balances = []
+        orphaned_account_ids = []
+        matched_account_ids = set()
 
         for account_list in all_accounts:
             for account in account_list:
-                matching_balance = None
-                for balance_list in all_balances:
-                    for balance in balance_list:
-                        if balance.account_id == account.id:
-                            matching_balance = balance
-                            break
-                    if matching_balance:
-                        break
-                    
+                matching_balance = balances_by_account_id.get(account.id)
+
                 if matching_balance:
                     accounts_with_balances.append({
                         "details": account,
                         "balance": matching_balance
                     })
+                    matched_account_ids.add(account.id)
                 else:
-                    logger.warning(f"No balance found for account_id: {account.id}")
+                    orphaned_account_ids.append(account.id)
+
+        orphaned_balance_ids = [account_id for account_id in balances_by_account_id if account_id not in matched_account_ids]
+        self._report_orphans(orphaned_account_ids, orphaned_balance_ids)
 
         return accounts_with_balances
     
     async def get_categorized_accounts(self, user_id: str) -> dict[str, CategorizedAccounts]:
         """
-        Fetch accounts and categorize them into debit and credit groups.
+        Fetch accounts and categorize them into debit and credit groups. The user's account links,
+        accounts and balances all live under the `Provider#` sort key prefix, so they are read with a
+        single query. The result is materialized as the user's account summary item, which the scheduler
+        rewrites after every balance consolidation, so most requests are answered with one key lookup.
+        Results are also cached per user for warm containers until the TTL expires or the user's accounts
+        change.
 
         Args:
             user_id (str): The user ID whose accounts need to be fetched and categorized.
@@ -127,80 +149,221 @@ class AccountService:
         Returns:
             dict[str, CategorizedAccounts]: Categorized accounts with 'debit' and 'credit' keys.
         """
-        logger.info("Fetching account links for user %s", user_id)
-        account_links = self.get_account_links(user_id)
+        categorized_accounts = self.categorized_accounts_cache.get(user_id)
+        if categorized_accounts is not None:
+            logger.info("Serving categorized accounts for user %s from cache", user_id)
+            return categorized_accounts
+
+        account_summary = await asyncio.to_thread(self.get_account_summary, user_id)
+        if account_summary is not None:
+            logger.info("Serving categorized accounts for user %s from the account summary", user_id)
+            categorized_accounts = self._summary_to_categorized_accounts(account_summary)
+            self.categorized_accounts_cache.set(user_id, categorized_accounts)
+            return categorized_accounts
+
+        logger.info("Fetching account links, accounts and balances for user %s", user_id)
+        accounts_with_balances = await asyncio.to_thread(self.refresh_account_summary, user_id)
+
+        categorized_accounts = self._categorize_accounts(accounts_with_balances)
+        self.categorized_accounts_cache.set(user_id, categorized_accounts)
+        return categorized_accounts
 
-        return self._categorize_accounts(self.get_accounts_and_balances_for_account_links(account_links))
-    
-    def get_accounts_and_balances_for_account_links(self, account_links: list[AccountLink]) -> list[dict]:
+    def refresh_account_summary(self, user_id: str) -> list[dict]:
         """
-        Retrieve accounts and their corresponding balances for a list of account links in one pass.
-        For each account link, it fetches both account and balance data from the database and combines 
-        them into dictionaries with the `details` (account) and `balance` (matching balance).
+        Rebuild a user's account summary from the account links, accounts and balances stored in their
+        partition, for when only some of their accounts were just consolidated.
 
         Args:
-            account_links (list[AccountLink]): A list of AccountLink objects for which account and balance data are to be retrieved.
+            user_id (str): The user whose summary is to be rebuilt.
 
         Returns:
-            list[dict]]: A list containing dictionaries with `details` (TellerAccount) and 
-                            `balance` (matching TellerAccountBalance) for each account link.
+            list[dict]: The user's stored accounts with their balances.
         """
-        table = db_client.get_table()
-        accounts_and_balances_for_links = []
+        items = self._get_provider_items(user_id)
+        account_links = [AccountLink(**item) for item in items if item.get("EntityType") == "Account Link"]
+
+        accounts_with_balances = self._match_accounts_and_balances(account_links, items)
+        self.put_account_summary(user_id, accounts_with_balances)
+        self.invalidate_categorized_accounts(user_id)
+        return accounts_with_balances
 
-        for account_link in account_links:
-            sort_key_prefix_accounts = f"Provider#{account_link.Provider}#Account#{account_link.ProviderID}#EntityID#"
-            sort_key_prefix_balances = f"Provider#{account_link.Provider}#Balance#{account_link.ProviderID}#EntityID#"
+    def get_account_summary(self, user_id: str) -> Optional[AccountSummary]:
+        """
+        Retrieve the materialized account summary of a user.
 
-            logger.info("Fetching accounts and balances for account link with PK: %s", account_link.PK)
+        Args:
+            user_id (str): The user whose summary is to be retrieved.
 
-            response_accounts = table.query(
-                KeyConditionExpression="PK = :pk and begins_with(SK, :sk_prefix_accounts)",
-                ExpressionAttributeValues={
-                    ":pk": account_link.PK,
-                    ":sk_prefix_accounts": sort_key_prefix_accounts,
-                }
-            )
+        Returns:
+            Optional[AccountSummary]: The summary, or None if it has not been written yet.
+        """
+        item = db_client.get_table().get_item(
+            Key={"PK": user_id, "SK": ACCOUNT_SUMMARY_SORT_KEY}
+        ).get("Item")
 
-            response_balances = table.query(
-                KeyConditionExpression="PK = :pk and begins_with(SK, :sk_prefix_balances)",
-                ExpressionAttributeValues={
-                    ":pk": account_link.PK,
-                    ":sk_prefix_balances": sort_key_prefix_balances,
-                }
-            )
+        return AccountSummary(**item) if item else None
 
-            items_accounts = response_accounts.get("Items", [])
-            items_balances = response_balances.get("Items", [])
+    def put_account_summary(self, user_id: str, accounts_with_balances: list[dict[str, Union[TellerAccount, TellerAccountBalance]]]) -> AccountSummary:
+        """
+        Write a user's categorized accounts, per-category totals and per-account balances as a single
+        summary item, so the accounts dashboard can be answered with one key lookup.
 
-            accounts = [Account(**item) for item in items_accounts]
-            balances = [Balance(**item) for item in items_balances]
+        Args:
+            user_id (str): The user the accounts belong to.
+            accounts_with_balances (list[dict]): The user's accounts with their balances.
 
-            logger.info("Retrieved %d accounts and %d balances for account link with PK: %s", len(accounts), len(balances), account_link.SK)
+        Returns:
+            AccountSummary: The summary that was written.
+        """
+        categorized_accounts = self._categorize_accounts(accounts_with_balances)
+        timestamp = int(datetime.now(tz=timezone.utc).timestamp())
 
-            accounts_and_balances = []
-            for account in accounts:
-                matching_balance = None
-                for balance in balances:
-                    if balance.EntityData.get("account_id") == account.EntityData.get('id'):
-                        matching_balance = TellerAccountBalance(
-                            ledger=float(balance.EntityData.get("ledger")),
-                            account_id=balance.EntityData.get("account_id"),
-                            available=float(balance.EntityData.get("available"))
+        entity_data = {
+            category: categorized.model_dump() for category, categorized in categorized_accounts.items()
+        }
+        entity_data["last_synced_at"] = timestamp
+
+        account_summary = AccountSummary(
+            PK=user_id,
+            SK=ACCOUNT_SUMMARY_SORT_KEY,
+            EntityType="Account Summary",
+            EntityData=json.loads(json.dumps(entity_data), parse_float=Decimal),
+            Timestamp=timestamp,
+        )
+        db_client.get_table().put_item(Item=account_summary.model_dump())
+
+        logger.info("Wrote account summary for user %s with %d accounts", user_id, len(accounts_with_balances))
+        return account_summary
+
+    def _summary_to_categorized_accounts(self, account_summary: AccountSummary) -> dict[str, CategorizedAccounts]:
+        categorized_accounts = {}
+
+        for category in ("debit", "credit"):
+            summary = account_summary.EntityData.get(category, {})
+            categorized_accounts[category] = CategorizedAccounts(
+                accounts=[
+                    {
+                        "details": TellerAccount(**account["details"]),
+                        "balance": TellerAccountBalance(
+                            ledger=float(account["balance"]["ledger"]),
+                            account_id=account["balance"]["account_id"],
+                            available=float(account["balance"]["available"])
                         )
-                        break
-                
-                if matching_balance:
-                    accounts_and_balances.append({
-                        "details": TellerAccount(**account.EntityData),
-                        "balance": matching_balance
-                    })
-                else:
-                    logger.warning(f"No balance found for account_id: {account.id}")
+                    }
+                    for account in summary.get("accounts", [])
+                ],
+                total_ledger=float(summary.get("total_ledger", 0)),
+                total_available=float(summary.get("total_available", 0)),
+            )
+
+        return categorized_accounts
+
+    def get_balance_history(self, user_id: str, account_id: str, from_date: str, to_date: str) -> list[BalanceHistoryPoint]:
+        """
+        Retrieve an account's balance history between two dates with a single query over its daily
+        history items, flattened into points in chronological order. Amounts are returned as the stored
+        decimal strings so no precision is lost.
 
-            accounts_and_balances_for_links.append(accounts_and_balances)
+        Args:
+            user_id (str): The user the account belongs to.
+            account_id (str): The Teller account ID.
+            from_date (str): The first day (YYYY-MM-DD) to include.
+            to_date (str): The last day (YYYY-MM-DD) to include.
+
+        Returns:
+            list[BalanceHistoryPoint]: The recorded balance points.
+        """
+        if from_date > to_date:
+            raise ValueError("from must not be after to")
+
+        items = db_client.query_items(
+            KeyConditionExpression=Key("PK").eq(user_id) & Key("SK").between(
+                get_balance_history_sort_key(account_id, from_date), get_balance_history_sort_key(account_id, to_date)
+            )
+        )
 
-        return [item for sublist in accounts_and_balances_for_links for item in sublist]
+        points = []
+        for item in items:
+            balance_history = BalanceHistory(**item)
+            history_date = balance_history.SK.rsplit("#", 1)[-1]
+            points.extend(
+                BalanceHistoryPoint(date=history_date, hour=int(hour), ledger=str(ledger), available=str(available))
+                for hour, (ledger, available) in sorted(balance_history.Points.items())
+            )
+
+        logger.info("Retrieved %d balance history points for account %s of user %s", len(points), account_id, user_id)
+        return points
+
+    def invalidate_categorized_accounts(self, user_id: str):
+        """
+        Drop a user's cached categorized accounts after their links, accounts or balances change.
+
+        Args:
+            user_id (str): The user whose cached accounts are stale.
+        """
+        self.categorized_accounts_cache.invalidate(user_id)
+    
+    def _get_provider_items(self, user_id: str) -> list[dict]:
+        """
+        Read every provider-scoped item (account links, accounts, balances) in a user's partition.
+        """
+        return list(db_client.query_items(
+            KeyConditionExpression=Key("PK").eq(user_id) & Key("SK").begins_with("Provider#")
+        ))
+
+    def _match_accounts_and_balances(self, account_links: list[AccountLink], items: list[dict]) -> list[dict]:
+        """
+        Pair the stored accounts of the given account links with their stored balances, joining on the
+        provider, access token and account ID in a single pass over the items.
+        """
+        link_keys = {(account_link.Provider, account_link.ProviderID) for account_link in account_links}
+        accounts: list[Account] = []
+        balances_by_key: dict[tuple[str, str, str], Balance] = {}
+
+        for item in items:
+            link_key = (item.get("Provider"), item.get("ProviderID"))
+            if link_key not in link_keys:
+                continue
+
+            if item.get("EntityType") == "Account":
+                accounts.append(Account(**item))
+            elif item.get("EntityType") == "Balance":
+                balance = Balance(**item)
+                balances_by_key[(*link_key, balance.EntityData.get("account_id"))] = balance
+
+        logger.info("Retrieved %d accounts and %d balances for %d account links", len(accounts), len(balances_by_key), len(account_links))
+
+        accounts_and_balances = []
+        orphaned_account_ids = []
+        matched_keys = set()
+
+        for account in accounts:
+            key = (account.Provider, account.ProviderID, account.EntityData.get("id"))
+            balance = balances_by_key.get(key)
+
+            if balance:
+                accounts_and_balances.append({
+                    "details": TellerAccount(**account.EntityData),
+                    "balance": TellerAccountBalance(
+                        ledger=float(balance.EntityData.get("ledger")),
+                        account_id=balance.EntityData.get("account_id"),
+                        available=float(balance.EntityData.get("available"))
+                    )
+                })
+                matched_keys.add(key)
+            else:
+                orphaned_account_ids.append(account.EntityID)
+
+        orphaned_balance_ids = [key[2] for key in balances_by_key if key not in matched_keys]
+        self._report_orphans(orphaned_account_ids, orphaned_balance_ids)
+
+        return accounts_and_balances
+
+    def _report_orphans(self, orphaned_account_ids: list[str], orphaned_balance_ids: list[str]):
+        if orphaned_account_ids:
+            logger.warning("No balance found for %d accounts: %s", len(orphaned_account_ids), orphaned_account_ids)
+        if orphaned_balance_ids:
+            logger.warning("No account found for %d balances: %s", len(orphaned_balance_ids), orphaned_balance_ids)
 
     def _categorize_accounts(self, accounts_with_balances: list[dict[str, Union[TellerAccount, TellerAccountBalance]]]) -> dict[str, CategorizedAccounts]:
         """
@@ -1,11 +1,23 @@
+import hashlib
 import os
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
 from fastapi import Request, HTTPException
-from jose import jwt, JWTError
+from fastapi.concurrency import run_in_threadpool
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
 import requests
 
 
 class AuthenticationService:
+    _public_keys: dict[str, Key] = {}
+    _public_keys_fetched_at: Optional[float] = None
+    _public_keys_lock = threading.Lock()
+    _verified_tokens: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+    _verified_tokens_lock = threading.Lock()
+
     def __init__(self):
         self.COGNITO_USER_POOL_ID: str = os.getenv("COGNITO_USER_POOL_ID", "")
         self.COGNITO_APP_CLIENT_ID: str = os.getenv("COGNITO_APP_CLIENT_ID", "")
@@ -16,6 +28,10 @@ class AuthenticationService:
             f"{self.COGNITO_USER_POOL_ID}/.well-known/jwks.json"
         )
 
+        self.JWKS_TTL_SECONDS: float = float(os.getenv("COGNITO_JWKS_TTL_SECONDS", "3600"))
+        self.JWKS_MIN_REFRESH_SECONDS: float = float(os.getenv("COGNITO_JWKS_MIN_REFRESH_SECONDS", "60"))
+        self.VERIFIED_TOKEN_CACHE_SIZE: int = int(os.getenv("VERIFIED_TOKEN_CACHE_SIZE", "1024"))
+
     def get_cognito_public_keys(self) -> list[dict[str, Any]]:
         """
         Fetches Cognito public keys used to validate JWT tokens.
@@ -32,9 +48,76 @@ class AuthenticationService:
                 status_code=500, detail=f"Error fetching Cognito public keys: {str(e)}"
             )
 
+    def get_public_key(self, kid: str) -> Optional[Key]:
+        """
+        Returns the prebuilt RSA key for a key ID from the process-wide JWKS cache. The JWKS is fetched
+        again when the cache has expired or the key ID is unknown (Cognito rotated its keys); concurrent
+        callers wait for a single refresh instead of each fetching the keys.
+
+        Args:
+            kid (str): The key ID from the token header.
+
+        Returns:
+            Optional[Key]: The public key, or None if Cognito does not publish it.
+        """
+        cls = AuthenticationService
+        key = cls._public_keys.get(kid)
+        if key is not None and time.monotonic() - cls._public_keys_fetched_at < self.JWKS_TTL_SECONDS:
+            return key
+
+        with cls._public_keys_lock:
+            key = cls._public_keys.get(kid)
+
+            # monotonic() counts from an arbitrary point such as boot, so "never fetched" is tracked
+            # separately rather than as an age measured from zero.
+            if cls._public_keys_fetched_at is not None:
+                age = time.monotonic() - cls._public_keys_fetched_at
+                if age < self.JWKS_TTL_SECONDS and (key is not None or age < self.JWKS_MIN_REFRESH_SECONDS):
+                    return key
+
+            try:
+                public_keys = self.get_cognito_public_keys()
+            except HTTPException:
+                if key is not None:
+                    return key
+                raise
+
+            cls._public_keys = {
+                public_key["kid"]: jwk.construct(public_key, "RS256") for public_key in public_keys
+            }
+            cls._public_keys_fetched_at = time.monotonic()
+            return cls._public_keys.get(kid)
+
+    def get_cached_payload(self, token: str) -> Optional[dict[str, Any]]:
+        """
+        Returns the payload of a token verified earlier in this process, as long as it has not expired.
+        """
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+
+        with AuthenticationService._verified_tokens_lock:
+            payload = AuthenticationService._verified_tokens.get(token_hash)
+            if payload is None:
+                return None
+
+            if payload.get("exp", 0) <= time.time():
+                del AuthenticationService._verified_tokens[token_hash]
+                return None
+
+            AuthenticationService._verified_tokens.move_to_end(token_hash)
+            return payload
+
+    def cache_payload(self, token: str, payload: dict[str, Any]):
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+
+        with AuthenticationService._verified_tokens_lock:
+            AuthenticationService._verified_tokens[token_hash] = payload
+            AuthenticationService._verified_tokens.move_to_end(token_hash)
+            while len(AuthenticationService._verified_tokens) > self.VERIFIED_TOKEN_CACHE_SIZE:
+                AuthenticationService._verified_tokens.popitem(last=False)
+
     def decode_and_verify_token(self, token: str) -> dict[str, Any]:
         """
-        Decodes and verifies the JWT token using the public keys from Cognito.
+        Decodes and verifies the JWT token locally using the cached public keys from Cognito.
 
         Args:
             token (str): The JWT token to decode and verify.
@@ -47,21 +130,9 @@ class AuthenticationService:
             if unverified_header is None or "kid" not in unverified_header:
                 raise HTTPException(status_code=401, detail="Unable to find token kid.")
 
-            public_keys = self.get_cognito_public_keys()
-
-            rsa_key: dict[str, Any] = {}
-            for key in public_keys:
-                if key["kid"] == unverified_header["kid"]:
-                    rsa_key = {
-                        "kty": key["kty"],
-                        "kid": key["kid"],
-                        "use": key["use"],
-                        "n": key["n"],
-                        "e": key["e"],
-                    }
-                    break
-
-            if not rsa_key:
+            rsa_key = self.get_public_key(unverified_header["kid"])
+
+            if rsa_key is None:
                 raise HTTPException(
                     status_code=401, detail="Unable to find appropriate public key."
                 )
@@ -73,7 +144,10 @@ class AuthenticationService:
                 audience=self.COGNITO_APP_CLIENT_ID,
                 issuer=f"https://cognito-idp.{self.COGNITO_REGION}.amazonaws.com/{self.COGNITO_USER_POOL_ID}",
             )
+            self.cache_payload(token, payload)
             return payload
+        except HTTPException:
+            raise
         except JWTError as e:
             raise HTTPException(
                 status_code=401, detail=f"Token verification failed: {str(e)}"
@@ -99,7 +173,9 @@ class AuthenticationService:
 
         token = auth_header.split(" ")[1]
 
-        payload = self.decode_and_verify_token(token)
+        payload = self.get_cached_payload(token)
+        if payload is None:
+            payload = await run_in_threadpool(self.decode_and_verify_token, token)
 
         user_id = payload.get("sub")
         if not user_id:
@@ -1,5 +1,9 @@
-import logging
 import os
+import ssl
+import tempfile
+import threading
+import time
+from typing import Optional
 from repositories.secrets_repository import SecretsRepository
 from utils.logger import get_logger
 
@@ -8,57 +12,82 @@ logger = get_logger(__name__)
 class CertificateService:
     def __init__(self, secrets_repository: SecretsRepository):
         self.secrets_repository: SecretsRepository = secrets_repository
-        self.cert_file_path: str | None = None
-        self.key_file_path: str | None = None
+        self.refresh_seconds: float = float(os.getenv('CERT_REFRESH_SECONDS', '3600'))
+        self.ssl_context: Optional[ssl.SSLContext] = None
+        self.secret_versions: Optional[tuple[str, str]] = None
+        self.checked_at: float = 0.0
+        self._lock = threading.Lock()
 
-    def generate_certificates(self, cert: str, private_key: str) -> tuple[str, str]:
+    def build_ssl_context(self, cert: str, private_key: str) -> ssl.SSLContext:
         """
-        Generates certificate and private key files in the temporary directory.
+        Builds an SSL context presenting the given client certificate. `load_cert_chain` only accepts
+        paths, so the PEM is written to a private, uniquely named temporary file that is removed as
+        soon as it has been loaded.
 
         Args:
             cert (str): The certificate content.
             private_key (str): The private key content.
 
         Returns:
-            tuple[str, str]: Paths to the generated certificate and private key files.
+            ssl.SSLContext: The client SSL context.
         """
         try:
-            cert_file_path: str = '/tmp/cert.pem'
-            key_file_path: str = '/tmp/key.pem'
-
-            with open(cert_file_path, 'w') as cert_file:
-                cert_file.write(cert)
-
-            with open(key_file_path, 'w') as key_file:
-                key_file.write(private_key)
-
-            return cert_file_path, key_file_path
+            context = ssl.create_default_context()
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.pem') as pem_file:
+                pem_file.write(cert.rstrip() + '\n' + private_key)
+                pem_file.flush()
+                context.load_cert_chain(certfile=pem_file.name)
+            return context
         except Exception as e:
-            logger.error(f"Error generating certificate files: {e}")
-            raise RuntimeError("Failed to generate certificate files")
+            logger.error(f"Error building SSL context from certificates: {e}")
+            raise RuntimeError("Failed to build SSL context from certificates")
+
+    def needs_refresh(self) -> bool:
+        """
+        Whether the SSL context has not been built yet or is due for a secret version check.
+        """
+        return self.ssl_context is None or time.monotonic() - self.checked_at >= self.refresh_seconds
 
-    def load_certificates(self) -> tuple[str, str]:
+    def get_ssl_context(self) -> ssl.SSLContext:
         """
-        Loads certificate and private key files, fetching them from secrets if not cached.
+        Returns the Teller client SSL context, building it once per process. Once the refresh interval
+        has passed, both secrets are read again in one batch and the context is only rebuilt if either secret
+        version changed.
 
         Returns:
-            tuple[str, str]: Paths to the certificate and private key files.
+            ssl.SSLContext: The client SSL context.
         """
-        cert_name: str | None = os.getenv('CERT_SECRET_NAME')
-        pk_name: str | None = os.getenv('PK_SECRET_NAME')
+        if not self.needs_refresh():
+            return self.ssl_context
+
+        with self._lock:
+            if not self.needs_refresh():
+                return self.ssl_context
+
+            cert_name: str | None = os.getenv('CERT_SECRET_NAME')
+            pk_name: str | None = os.getenv('PK_SECRET_NAME')
+
+            if not cert_name or not pk_name:
+                logger.error("Certificate or private key secret name is missing from environment variables")
+                raise RuntimeError("Missing certificate or private key secret names")
+
+            logger.info("Retrieving certificates from secrets repository.")
 
-        if self.cert_file_path and self.key_file_path:
-            logger.info("Using cached certificates")
-            return self.cert_file_path, self.key_file_path
+            try:
+                secrets = self.secrets_repository.get_secrets_with_versions([cert_name, pk_name])
+                cert, cert_version = secrets[cert_name]
+                private_key, pk_version = secrets[pk_name]
+            except Exception:
+                if self.ssl_context is None:
+                    raise
+                logger.warning("Failed to check certificate versions, keeping the current SSL context")
+                self.checked_at = time.monotonic()
+                return self.ssl_context
 
-        if not cert_name or not pk_name:
-            logger.error("Certificate or private key secret name is missing from environment variables")
-            raise RuntimeError("Missing certificate or private key secret names")
-        
-        logger.info("Certificates not found, retrieving from secrets repository.")
-        
-        cert: str = self.secrets_repository.get_secret(cert_name)
-        private_key: str = self.secrets_repository.get_secret(pk_name)
+            if self.ssl_context is None or self.secret_versions != (cert_version, pk_version):
+                self.ssl_context = self.build_ssl_context(cert, private_key)
+                self.secret_versions = (cert_version, pk_version)
+                logger.info("Built Teller SSL context for certificate versions %s", self.secret_versions)
 
-        self.cert_file_path, self.key_file_path = self.generate_certificates(cert, private_key)
-        return self.cert_file_path, self.key_file_path
+            self.checked_at = time.monotonic()
+            return self.ssl_context
@@ -1,17 +1,18 @@
 import asyncio
-import requests
-from requests.auth import HTTPBasicAuth
+import os
+import httpx
 from models.account import AccountLink
-from services.certificate_service import CertificateService
-from typing import List, Optional
+from clients.teller_request_scheduler import TellerRequestScheduler
+from typing import AsyncIterator, List, Optional
 from models.teller import TellerAccount, TellerAccountBalance, TellerTransaction
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class TellerService:
-    def __init__(self, certificate_service: CertificateService):
-        self.certificate_service = certificate_service
+    def __init__(self, request_scheduler: TellerRequestScheduler):
+        self.request_scheduler = request_scheduler
+        self.transaction_page_size: int = int(os.getenv("TELLER_TRANSACTION_PAGE_SIZE", "250"))
 
     async def fetch_accounts(self, access_token: str) -> List[TellerAccount]:
         """
@@ -23,18 +24,12 @@ class TellerService:
         Returns:
             List[TellerAccount]: A list of TellerAccount objects
         """
-        cert_file_path, key_file_path = self.certificate_service.load_certificates()
-        
-        api_url = "https://api.teller.io/accounts"
-        headers = {'Content-Type': 'application/json'}
-        auth = HTTPBasicAuth(access_token, '')
-
         try:
-            response = requests.get(api_url, headers=headers, auth=auth, cert=(cert_file_path, key_file_path))
+            response = await self.request_scheduler.get(access_token, "/accounts")
             response.raise_for_status()
             logger.info("Response from Teller: %s", response.json())
             return[TellerAccount(**account) for account in response.json()]
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Teller API request error: {e}")
             raise RuntimeError("Failed to call Teller API")
         except Exception as e:
@@ -52,14 +47,8 @@ class TellerService:
         Returns:
             TellerAccountBalance: A TellerAccountBalance object containing the balance information.
         """
-        cert_file_path, key_file_path = self.certificate_service.load_certificates()
-
-        api_url = f"https://api.teller.io/accounts/{account_id}/balances"
-        headers = {'Content-Type': 'application/json'}
-        auth = HTTPBasicAuth(access_token, '')
-
         try:
-            response = requests.get(api_url, headers=headers, auth=auth, cert=(cert_file_path, key_file_path))
+            response = await self.request_scheduler.get(access_token, f"/accounts/{account_id}/balances")
             response.raise_for_status()
             data = response.json()
 
@@ -70,7 +59,7 @@ class TellerService:
             
             logger.info("Response from Teller: %s", data)
             return TellerAccountBalance(**data)
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Teller API request error: {e}")
             raise RuntimeError("Failed to call Teller API")
         except Exception as e:
@@ -78,7 +67,7 @@ class TellerService:
             raise RuntimeError("An unexpected error occurred when calling Teller")
         
     async def fetch_account_transactions(
-        self, access_token: str, account_id: str, from_transaction_id: Optional[str] = None
+        self, access_token: str, account_id: str, from_transaction_id: Optional[str] = None, count: Optional[int] = None
     ) -> List[TellerTransaction]:
         """
         Fetches the transactions for an account from Teller for a given account ID using the provided access token.
@@ -87,33 +76,69 @@ class TellerService:
             access_token (str): The access token associated with the linked account.
             account_id (str): The unique identifier for the account whose transactions is to be fetched.
             from_transaction_id (Optional[str]): The ID of the transaction to start fetching from (optional).
+            count (Optional[int]): The maximum number of transactions to return (optional).
 
         Returns:
-            List[TellerTransaction]: A list of TellerTransaction objects.
+            List[TellerTransaction]: A list of TellerTransaction objects, newest first.
         """
-        cert_file_path, key_file_path = self.certificate_service.load_certificates()
-
-        api_url = f"https://api.teller.io/accounts/{account_id}/transactions"
+        params = {}
         if from_transaction_id:
-            api_url += f"?from_id={from_transaction_id}"
-
-        headers = {'Content-Type': 'application/json'}
-        auth = HTTPBasicAuth(access_token, '')
+            params["from_id"] = from_transaction_id
+        if count:
+            params["count"] = count
 
         try:
-            response = requests.get(api_url, headers=headers, auth=auth, cert=(cert_file_path, key_file_path))
+            response = await self.request_scheduler.get(access_token, f"/accounts/{account_id}/transactions", params=params or None)
             response.raise_for_status()
-            data = response.json()
-            
-            logger.info("Response from Teller: %s", data)
-            return [TellerTransaction(**transaction) for transaction in data]
-        except requests.exceptions.RequestException as e:
+            transactions = [TellerTransaction(**transaction) for transaction in response.json()]
+
+            logger.debug("Fetched a page of %d transactions for account %s", len(transactions), account_id)
+            return transactions
+        except httpx.HTTPError as e:
             logger.error(f"Teller API request error: {e}")
             raise RuntimeError("Failed to call Teller API")
         except Exception as e:
             logger.error(f"Unexpected error when calling Teller: {e}")
             raise RuntimeError("An unexpected error occurred when calling Teller")
         
+    async def iter_account_transaction_pages(
+        self, access_token: str, account_id: str, since_date: Optional[str] = None
+    ) -> AsyncIterator[List[TellerTransaction]]:
+        """
+        Pages through an account's transactions from newest to oldest, yielding one page at a time and
+        stopping once a page reaches transactions older than `since_date`. The next page is requested
+        before the current one is yielded, so the caller can process a page while the following one is
+        in flight and only two pages are held in memory at once.
+
+        Args:
+            access_token (str): The access token associated with the linked account.
+            account_id (str): The unique identifier for the account whose transactions are to be fetched.
+            since_date (Optional[str]): The oldest transaction date (YYYY-MM-DD) to return (optional).
+
+        Yields:
+            List[TellerTransaction]: Each non-empty page of transactions dated on or after `since_date`, newest first.
+        """
+        def fetch_page(from_transaction_id: Optional[str]) -> "asyncio.Task[List[TellerTransaction]]":
+            return asyncio.create_task(self.fetch_account_transactions(
+                access_token, account_id, from_transaction_id=from_transaction_id, count=self.transaction_page_size
+            ))
+
+        next_page = fetch_page(None)
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+
+                in_range = [transaction for transaction in page if transaction.date >= since_date] if since_date else page
+                if len(page) == self.transaction_page_size and len(in_range) == len(page):
+                    next_page = fetch_page(page[-1].id)
+
+                if in_range:
+                    yield in_range
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
     async def fetch_all_accounts_for_links(self, account_links: list[AccountLink]) -> list[list[TellerAccount]]:
         """
         Fetch all accounts for a list of account links.
@@ -150,3 +175,17 @@ class TellerService:
         ]
         return await asyncio.gather(*[asyncio.gather(*tasks) for tasks in balance_tasks])
 
+    async def close(self):
+        """
+        Releases the pooled Teller connections held for the running event loop.
+        """
+        await self.request_scheduler.close()
+
+    def get_request_metrics(self) -> dict:
+        """
+        Returns the Teller request counters and queue wait statistics collected since the last reset.
+        """
+        return self.request_scheduler.metrics.snapshot()
+
+    def reset_request_metrics(self):
+        self.request_scheduler.metrics.reset()
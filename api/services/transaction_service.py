@@ -1,59 +1,118 @@
-from typing import Optional
-from models.transaction import Transaction
+import base64
+import json
+from typing import Any, Optional
+from models.transaction import Transaction, TRANSACTION_SORT_KEY_PREFIX, get_account_transaction_date
 from services.teller_service import TellerService
 from models.teller import TellerTransaction, TellerTransactionDetails
-from db.dynamodb_client import db_client
-from boto3.dynamodb.conditions import Key, Attr
+from db.dynamodb_client import db_client, ACCOUNT_TRANSACTION_INDEX_NAME, TRANSACTION_DATE_INDEX_NAME
+from boto3.dynamodb.conditions import Key
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+DATE_RANGE_UPPER_BOUND = "\uffff"
+
 class TransactionService:
     def __init__(self, teller_service: TellerService):
         self.teller_service = teller_service
 
-    def get_transactions(self, user_id: str) -> list[TellerTransaction]:
+    def get_transactions(
+        self, user_id: str, limit: int = 100, cursor: Optional[str] = None, from_date: Optional[str] = None,
+        to_date: Optional[str] = None, account_id: Optional[str] = None
+    ) -> tuple[list[TellerTransaction], Optional[str]]:
         """
-        Retrieve all transactions for a given user from the database, process their EntityData field,
-        and map them into TellerTransaction objects.
+        Retrieve a page of transactions for a given user, newest first, process their EntityData field and
+        map them into TellerTransaction objects. Transactions for a single account are read from the account
+        transaction index, so only that account's rows are touched.
 
         Args:
             user_id (str): The ID of the user for whom transactions are to be retrieved.
+            limit (int): The maximum number of transactions to return.
+            cursor (Optional[str]): The opaque cursor returned with the previous page (optional).
+            from_date (Optional[str]): The earliest transaction date (YYYY-MM-DD) to include (optional).
+            to_date (Optional[str]): The latest transaction date (YYYY-MM-DD) to include (optional).
+            account_id (Optional[str]): Only return transactions for this Teller account (optional).
 
         Returns:
-            list[TellerTransaction]: A list of TellerTransaction objects sorted in descending order by the date field.
+            tuple[list[TellerTransaction], Optional[str]]: The transactions in descending date order and the cursor
+            for the next page, or None if there are no more transactions.
         """
-        table = db_client.get_table()
-        response_transactions = table.query(
-            KeyConditionExpression=Key("PK").eq(user_id),
-            FilterExpression=Attr("EntityType").eq("Transaction")
+        if from_date and to_date and from_date > to_date:
+            raise ValueError("from must not be after to")
+
+        if account_id:
+            index_name, range_key = ACCOUNT_TRANSACTION_INDEX_NAME, "AccountTransactionDate"
+            key_prefix = f"{account_id}#"
+        else:
+            index_name, range_key = TRANSACTION_DATE_INDEX_NAME, "TransactionDate"
+            key_prefix = ""
+
+        lower_bound = f"{key_prefix}{from_date or ''}"
+        upper_bound = f"{key_prefix}{to_date}#{DATE_RANGE_UPPER_BOUND}" if to_date else f"{key_prefix}{DATE_RANGE_UPPER_BOUND}"
+
+        key_condition = Key("PK").eq(user_id)
+        if lower_bound:
+            key_condition &= Key(range_key).between(lower_bound, upper_bound)
+        elif to_date:
+            key_condition &= Key(range_key).lte(upper_bound)
+
+        query_kwargs = {
+            "IndexName": index_name,
+            "KeyConditionExpression": key_condition,
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if cursor:
+            query_kwargs["ExclusiveStartKey"] = self._decode_cursor(user_id, cursor, range_key)
+
+        items = []
+        for page in db_client.query_pages(**query_kwargs):
+            items.extend(page[:limit - len(items)])
+            if len(items) >= limit:
+                break
+
+        transactions = [self._to_teller_transaction(Transaction(**item)) for item in items]
+        next_cursor = self._encode_cursor(items[-1], range_key) if len(items) >= limit else None
+
+        logger.info("Retrieved %d transactions for user: %s", len(transactions), user_id)
+        return transactions, next_cursor
+
+    def _to_teller_transaction(self, transaction: Transaction) -> TellerTransaction:
+        entity_data = transaction.EntityData
+        return TellerTransaction(
+            details=TellerTransactionDetails(**entity_data["details"]),
+            running_balance=entity_data["running_balance"],
+            description=entity_data["description"],
+            id=entity_data["id"],
+            date=entity_data["date"],
+            account_id=entity_data["account_id"],
+            amount=float(entity_data["amount"]),
+            type=entity_data["type"],
+            status=entity_data["status"]
         )
 
-        transactions = []
-        
-        for item in response_transactions.get("Items", []):
-            transaction = Transaction(**item)
-            entity_data = transaction.EntityData
-            transactions.append(TellerTransaction(
-                details=TellerTransactionDetails(**entity_data["details"]),
-                running_balance=entity_data["running_balance"],
-                description=entity_data["description"],
-                id=entity_data["id"],
-                date=entity_data["date"],
-                account_id=entity_data["account_id"],
-                amount=float(entity_data["amount"]),
-                type=entity_data["type"],
-                status=entity_data["status"]
-            ))
-        
-        transactions.sort(key=lambda x: x.date, reverse=True)
-        
-        logger.info("Retrieved and sorted %d transactions for user: %s", len(transactions), user_id)
-        return transactions
-    
+    def _encode_cursor(self, item: dict[str, Any], range_key: str) -> str:
+        key = {"PK": item["PK"], "SK": item["SK"], range_key: item[range_key]}
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    def _decode_cursor(self, user_id: str, cursor: str, range_key: str) -> dict[str, str]:
+        """
+        Decode a page cursor back into the index key to resume from, rejecting cursors issued to another
+        user or for another index.
+        """
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+
+        if not isinstance(key, dict) or set(key) != {"PK", "SK", range_key} or key["PK"] != user_id:
+            raise ValueError("Invalid cursor")
+        return key
+
     def edit_transaction(self, user_id: str, transaction_id: str, updated_fields: dict[str, Optional[str]]) -> bool:
         """
-        Edits a specific transaction in the database by updating the fields provided.
+        Edits a specific transaction in the database by updating the fields provided. The edited fields are
+        recorded on the item so later syncs from Teller do not overwrite them.
 
         Args:
             user_id (str): The ID of the user whose transaction is being updated.
@@ -65,19 +124,17 @@ class TransactionService:
         """
         table = db_client.get_table()
 
-        response = table.query(
-            KeyConditionExpression=Key("PK").eq(user_id),
-            FilterExpression=Attr("EntityType").eq("Transaction") & Attr("EntityID").eq(transaction_id),
-        )
+        item = table.get_item(
+            Key={"PK": user_id, "SK": f"{TRANSACTION_SORT_KEY_PREFIX}{transaction_id}"}
+        ).get("Item")
 
-        items = response.get("Items", [])
-        if not items:
+        if not item:
             logger.warning("Transaction with ID %s not found for user: %s", transaction_id, user_id)
             return False
 
-        item = items[0]
         transaction = Transaction(**item)
         entity_data = transaction.EntityData
+        edited_fields = set()
 
         for key, value in updated_fields.items():
             if key in entity_data:
@@ -86,11 +143,29 @@ class TransactionService:
                         if nested_key in entity_data[key]:
                             if nested_value is not None:
                                 entity_data[key][nested_key] = nested_value
+                                edited_fields.add(f"{key}.{nested_key}")
                                 logger.info("Updated nested field %s in %s to %s", nested_key, key, nested_value)
                 else:
                     if value is not None:
                         entity_data[key] = value
+                        edited_fields.add(key)
                         logger.info("Updated field %s to %s", key, value)
+
+        update_expression = (
+            "SET EntityData = :entity_data, TransactionDate = :transaction_date, "
+            "AccountTransactionDate = :account_transaction_date"
+        )
+        expression_attribute_values = {
+            ":entity_data": entity_data,
+            ":transaction_date": f"{entity_data['date']}#{transaction_id}",
+            ":account_transaction_date": get_account_transaction_date(
+                entity_data["account_id"], entity_data["date"], transaction_id
+            )
+        }
+        # Recorded so the scheduler's sync leaves these fields alone when Teller's copy changes.
+        if edited_fields:
+            update_expression += " ADD UserEditedFields :edited_fields"
+            expression_attribute_values[":edited_fields"] = edited_fields
         try:
             logger.info("Attempting to update transaction with PK %s and SK %s using EntityData %s", transaction.PK, transaction.SK, entity_data)
             table.update_item(
@@ -98,13 +173,11 @@ class TransactionService:
                     "PK": transaction.PK,
                     "SK": transaction.SK
                 },
-                UpdateExpression="SET EntityData = :entity_data",
-                ExpressionAttributeValues={
-                    ":entity_data": entity_data
-                }
+                UpdateExpression=update_expression,
+                ExpressionAttributeValues=expression_attribute_values
             )
             logger.info("Successfully updated transaction with ID %s for user: %s", transaction_id, user_id)
             return True
         except Exception as e:
             logger.error("Error updating transaction: %s", e)
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,21 @@
+import os
+import threading
+from typing import Optional
+import boto3
+
+_session: Optional[boto3.session.Session] = None
+_session_lock = threading.Lock()
+
+def get_boto3_session() -> boto3.session.Session:
+    """
+    Returns the boto3 session shared by every AWS client in the process, creating it on first use.
+
+    Returns:
+        boto3.session.Session: The shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = boto3.session.Session(region_name=os.getenv('AWS_REGION'))
+    return _session
@@ -0,0 +1,96 @@
+import os
+import time
+from functools import cached_property
+from typing import TYPE_CHECKING, Union
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from clients.teller_client import TellerClient
+    from clients.teller_request_scheduler import TellerRequestScheduler
+    from clients.work_queue import InProcessWorkQueue, SqsWorkQueue
+    from repositories.secrets_repository import SecretsRepository
+    from services.account_service import AccountService
+    from services.certificate_service import CertificateService
+    from services.scheduler_service import SchedulerService
+    from services.teller_service import TellerService
+    from services.transaction_service import TransactionService
+
+logger = get_logger(__name__)
+
+class ServiceContainer:
+    """
+    Builds the application's services on first use, so each Lambda only imports and constructs what
+    its entry point actually touches.
+    """
+
+    def __init__(self):
+        self.aws_region: str = os.getenv('AWS_REGION', 'us-east-1')
+
+    @cached_property
+    def secrets_repository(self) -> "SecretsRepository":
+        from repositories.secrets_repository import SecretsRepository
+        return SecretsRepository(region_name=self.aws_region)
+
+    @cached_property
+    def certificate_service(self) -> "CertificateService":
+        from services.certificate_service import CertificateService
+        return CertificateService(secrets_repository=self.secrets_repository)
+
+    @cached_property
+    def teller_client(self) -> "TellerClient":
+        from clients.teller_client import TellerClient
+        return TellerClient(certificate_service=self.certificate_service)
+
+    @cached_property
+    def teller_request_scheduler(self) -> "TellerRequestScheduler":
+        from clients.teller_request_scheduler import TellerRequestScheduler
+        return TellerRequestScheduler(teller_client=self.teller_client)
+
+    @cached_property
+    def teller_service(self) -> "TellerService":
+        from services.teller_service import TellerService
+        return TellerService(request_scheduler=self.teller_request_scheduler)
+
+    @cached_property
+    def account_service(self) -> "AccountService":
+        from services.account_service import AccountService
+        return AccountService(teller_service=self.teller_service)
+
+    @cached_property
+    def transaction_service(self) -> "TransactionService":
+        from services.transaction_service import TransactionService
+        return TransactionService(teller_service=self.teller_service)
+
+    @cached_property
+    def work_queue(self) -> Union["SqsWorkQueue", "InProcessWorkQueue"]:
+        queue_url = os.getenv('SCHEDULER_QUEUE_URL')
+        if queue_url:
+            from clients.work_queue import SqsWorkQueue
+            return SqsWorkQueue(queue_url=queue_url, region_name=self.aws_region)
+
+        from clients.work_queue import InProcessWorkQueue
+        return InProcessWorkQueue()
+
+    @cached_property
+    def scheduler_service(self) -> "SchedulerService":
+        from services.scheduler_service import SchedulerService
+        return SchedulerService(
+            account_service=self.account_service, teller_service=self.teller_service, work_queue=self.work_queue
+        )
+
+def log_startup_duration(name: str, started_at: float):
+    """
+    Logs how long a Lambda entry point took to import and wire up, warning when it exceeds the
+    `STARTUP_BUDGET_MS` budget.
+
+    Args:
+        name (str): The entry point being measured.
+        started_at (float): The `time.perf_counter()` value taken at the top of the module.
+    """
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    budget_ms = float(os.getenv("STARTUP_BUDGET_MS", "750"))
+
+    if duration_ms > budget_ms:
+        logger.warning("%s startup took %.1f ms, over the %.0f ms budget", name, duration_ms, budget_ms)
+    else:
+        logger.info("%s startup took %.1f ms", name, duration_ms)
@@ -7,8 +7,77 @@ ACCOUNT_ID=$2
 ENVIRONMENT=$3
 RESOURCE_BASE_IDENTIFIER="expenzo"
 STACK_NAME="${RESOURCE_BASE_IDENTIFIER}-${ENVIRONMENT}"
+TABLE_NAME="${RESOURCE_BASE_IDENTIFIER}-${ENVIRONMENT}"
 REGION="us-east-1"
 
+# The table's global secondary indexes, in the order db.yml adds them. DynamoDB creates at most one
+# index per table update, so an existing table is brought up one index (one stack update) at a time.
+INDEXES=(EntityTypeIndex TransactionDateIndex AccountTransactionIndex AccountSyncIndex)
+# One-off data tasks to run once the matching index stage is live, space separated.
+INDEX_STAGE_TASKS=(
+  "backfill_entity_type_index"
+  "migrate_transaction_keys backfill_transaction_dates"
+  ""
+  ""
+)
+
+# Prints how many of INDEXES the table already has, in order, or -1 if the table does not exist yet.
+get_index_stage() {
+  local existing
+  if ! existing=$(aws dynamodb describe-table --table-name $TABLE_NAME --region $REGION \
+    --query "Table.GlobalSecondaryIndexes[].IndexName" --output text 2>/dev/null); then
+    echo -1
+    return
+  fi
+
+  local stage=0
+  for index in "${INDEXES[@]}"; do
+    if [[ " $(echo $existing | tr '\t' ' ') " != *" $index "* ]]; then
+      break
+    fi
+    stage=$((stage + 1))
+  done
+  echo $stage
+}
+
+deploy_stack() {
+  local index_stage=$1
+  echo "Deploying SAM application with ${index_stage} table indexes..."
+  sam deploy \
+    --template-file packaged.yaml \
+    --stack-name $STACK_NAME \
+    --parameter-overrides Environment=${ENVIRONMENT} DeploymentRoleARN=${ASSUMED_ROLE_ARN} ResourceBaseIdentifier=${RESOURCE_BASE_IDENTIFIER} DBIndexRolloutStage=${index_stage} \
+    --capabilities CAPABILITY_IAM CAPABILITY_NAMED_IAM CAPABILITY_AUTO_EXPAND \
+    --region $REGION \
+    --no-fail-on-empty-changeset
+}
+
+run_scheduled_task() {
+  local task=$1
+  local api_stack function_name function_error
+  api_stack=$(aws cloudformation describe-stack-resource --stack-name $STACK_NAME --logical-resource-id API \
+    --region $REGION --query "StackResourceDetail.PhysicalResourceId" --output text)
+  function_name=$(aws cloudformation describe-stack-resource --stack-name $api_stack \
+    --logical-resource-id ExpenzoScheduledTaskFunction --region $REGION \
+    --query "StackResourceDetail.PhysicalResourceId" --output text)
+
+  echo "Running task ${task} on ${function_name}..."
+  function_error=$(aws lambda invoke \
+    --function-name $function_name \
+    --payload "{\"task\": \"${task}\"}" \
+    --cli-binary-format raw-in-base64-out \
+    --cli-read-timeout 900 \
+    --region $REGION \
+    --query "FunctionError" --output text \
+    "${task}-response.json")
+
+  if [[ "$function_error" != "None" ]]; then
+    echo "Task ${task} failed:"
+    cat "${task}-response.json"
+    exit 1
+  fi
+}
+
 STACK_STATUS=$(aws cloudformation describe-stacks --stack-name $STACK_NAME --query "Stacks[0].StackStatus" --output text || echo "NOT_FOUND")
 
 if [[ "$STACK_STATUS" == "ROLLBACK_COMPLETE" ]]; then
@@ -22,13 +91,22 @@ else
   echo "Stack not found. Proceeding with deployment."
 fi
 
-echo "Deploying SAM application..."
-sam deploy \
-  --template-file packaged.yaml \
-  --stack-name $STACK_NAME \
-  --parameter-overrides Environment=${ENVIRONMENT} DeploymentRoleARN=${ASSUMED_ROLE_ARN} ResourceBaseIdentifier=${RESOURCE_BASE_IDENTIFIER} \
-  --capabilities CAPABILITY_IAM CAPABILITY_NAMED_IAM CAPABILITY_AUTO_EXPAND \
-  --region $REGION
+INDEX_STAGE=$(get_index_stage)
+if [[ "$INDEX_STAGE" -lt 0 ]]; then
+  # A new table can be created with every index in one update.
+  deploy_stack ${#INDEXES[@]}
+else
+  if [[ "$INDEX_STAGE" -eq ${#INDEXES[@]} ]]; then
+    deploy_stack $INDEX_STAGE
+  fi
+  while [[ "$INDEX_STAGE" -lt ${#INDEXES[@]} ]]; do
+    INDEX_STAGE=$((INDEX_STAGE + 1))
+    deploy_stack $INDEX_STAGE
+    for task in ${INDEX_STAGE_TASKS[$((INDEX_STAGE - 1))]}; do
+      run_scheduled_task $task
+    done
+  done
+fi
 
 echo "Syncing build files to S3 bucket: s3://${STACK_NAME}/..."
 aws s3 sync out s3://${STACK_NAME}/ --delete
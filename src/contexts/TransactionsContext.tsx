@@ -6,6 +6,18 @@ import { useAuth } from "@/contexts/AuthenticationContext";
 import { fetchTransactions } from "@/services/transactionService";
 import { isEqual } from "lodash";
 
+const TRANSACTIONS_LOOKBACK_DAYS = 90;
+const TRANSACTIONS_PAGE_SIZE = 500;
+
+const getTransactionsParams = () => {
+  const from = new Date();
+  from.setDate(from.getDate() - TRANSACTIONS_LOOKBACK_DAYS);
+  return {
+    from: from.toISOString().slice(0, 10),
+    limit: TRANSACTIONS_PAGE_SIZE,
+  };
+};
+
 interface TransactionsContextType {
   transactions: GetTransactionsResponse | null;
   transactionsLoading: boolean;
@@ -44,7 +56,10 @@ export const TransactionsProvider = ({
   const refreshTransactions = async () => {
     try {
       setTransactionsLoading(true);
-      const transactionsData = await fetchTransactions(getToken);
+      const transactionsData = await fetchTransactions(
+        getToken,
+        getTransactionsParams()
+      );
       if (!isEqual(transactions, transactionsData)) {
         setTransactions(transactionsData);
       }
@@ -65,7 +80,10 @@ export const TransactionsProvider = ({
 
       try {
         setTransactionsLoading(true);
-        const transactionsData = await fetchTransactions(getToken);
+        const transactionsData = await fetchTransactions(
+          getToken,
+          getTransactionsParams()
+        );
         if (!isEqual(transactions, transactionsData)) {
           setTransactions(transactionsData);
         }
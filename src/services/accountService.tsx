@@ -1,5 +1,9 @@
 import apiClient from "@/lib/apiClient";
-import { GetAccountsResponse } from "../types/api";
+import {
+  GetAccountsResponse,
+  GetBalanceHistoryParams,
+  GetBalanceHistoryResponse,
+} from "../types/api";
 
 const client = apiClient();
 
@@ -27,3 +31,21 @@ export const createAccount = async (
   });
   return response.data;
 };
+
+export const fetchBalanceHistory = async (
+  getToken: () => string | null,
+  accountId: string,
+  params: GetBalanceHistoryParams = {}
+): Promise<GetBalanceHistoryResponse> => {
+  const token = getToken();
+  const response = await client.get<GetBalanceHistoryResponse>(
+    `/accounts/${encodeURIComponent(accountId)}/balance-history`,
+    {
+      params,
+      headers: {
+        Authorization: token ? `Bearer ${token}` : undefined,
+      },
+    }
+  );
+  return response.data;
+};
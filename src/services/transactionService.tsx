@@ -1,13 +1,19 @@
 import apiClient from "@/lib/apiClient";
-import { GetTransactionsResponse, Transaction } from "../types/api";
+import {
+  GetTransactionsParams,
+  GetTransactionsResponse,
+  Transaction,
+} from "../types/api";
 
 const client = apiClient();
 
-export const fetchTransactions = async (
-  getToken: () => string | null
+export const fetchTransactionsPage = async (
+  getToken: () => string | null,
+  params: GetTransactionsParams = {}
 ): Promise<GetTransactionsResponse> => {
   const token = getToken();
   const response = await client.get<GetTransactionsResponse>(`/transactions`, {
+    params,
     headers: {
       Authorization: token ? `Bearer ${token}` : undefined,
     },
@@ -15,6 +21,40 @@ export const fetchTransactions = async (
   return response.data;
 };
 
+export const fetchTransactions = async (
+  getToken: () => string | null,
+  params: Omit<GetTransactionsParams, "cursor"> & { from: string }
+): Promise<GetTransactionsResponse> => {
+  const transactions: Transaction[] = [];
+  let cursor: string | undefined;
+
+  do {
+    const page = await fetchTransactionsPage(getToken, { ...params, cursor });
+    transactions.push(...page.transactions);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+
+  return { transactions };
+};
+
+export const fetchAccountTransactionsPage = async (
+  getToken: () => string | null,
+  accountId: string,
+  params: Omit<GetTransactionsParams, "account_id"> = {}
+): Promise<GetTransactionsResponse> => {
+  const token = getToken();
+  const response = await client.get<GetTransactionsResponse>(
+    `/accounts/${encodeURIComponent(accountId)}/transactions`,
+    {
+      params,
+      headers: {
+        Authorization: token ? `Bearer ${token}` : undefined,
+      },
+    }
+  );
+  return response.data;
+};
+
 export const updateTransaction = async (
   getToken: () => string | null,
   transactionId: string,
@@ -73,4 +73,30 @@ export interface Transaction {
 
 export interface GetTransactionsResponse {
   transactions: Transaction[];
+  next_cursor?: string | null;
+}
+
+export interface GetTransactionsParams {
+  limit?: number;
+  cursor?: string;
+  from?: string;
+  to?: string;
+  account_id?: string;
+}
+
+export interface BalanceHistoryPoint {
+  date: string;
+  hour: number;
+  ledger: string;
+  available: string;
+}
+
+export interface GetBalanceHistoryResponse {
+  account_id: string;
+  points: BalanceHistoryPoint[];
+}
+
+export interface GetBalanceHistoryParams {
+  from?: string;
+  to?: string;
 }